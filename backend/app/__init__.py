@@ -1,8 +1,11 @@
+import orjson
 from flask import Flask
+from flask.json.provider import JSONProvider, DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
 from flask_marshmallow import Marshmallow
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from flask_caching import Cache
 from config import Config
 
 # Initialize extensions
@@ -10,6 +13,44 @@ db = SQLAlchemy()
 ma = Marshmallow()
 jwt = JWTManager()
 cors = CORS()
+cache = Cache()
+
+class OrjsonProvider(JSONProvider):
+    """
+    JSON provider backed by orjson, used for every dict/list a route returns
+    and for jsonify(). Keys stay sorted to match Flask's default output.
+    """
+    option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=DefaultJSONProvider.default, option=self.option)
+        return self._app.response_class(body, mimetype='application/json')
+
+def load_jwt_keys(app):
+    """
+    Parses PEM keys for asymmetric JWT algorithms once at startup.
+    flask_jwt_extended passes key objects straight through to PyJWT,
+    so tokens are no longer verified against a freshly parsed PEM each time.
+    """
+    if app.config['JWT_ALGORITHM'][:2] not in ('RS', 'ES', 'PS'):
+        return
+
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+
+    public_key = app.config.get('JWT_PUBLIC_KEY')
+    if isinstance(public_key, str):
+        app.config['JWT_PUBLIC_KEY'] = load_pem_public_key(public_key.encode())
+    private_key = app.config.get('JWT_PRIVATE_KEY')
+    if isinstance(private_key, str):
+        app.config['JWT_PRIVATE_KEY'] = load_pem_private_key(private_key.encode(), password=None)
 
 def create_app(config_class=Config):
     """
@@ -18,11 +59,14 @@ def create_app(config_class=Config):
     """
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.json = OrjsonProvider(app)
+    load_jwt_keys(app)
 
     # Initialize extensions with the app
     db.init_app(app)
     ma.init_app(app)
     jwt.init_app(app)
+    cache.init_app(app)
     # Enable CORS for the React frontend
 # Allow any origin during development
     cors.init_app(app, resources={r"/api/*": {"origins": "*"}})
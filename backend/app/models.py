@@ -1,7 +1,44 @@
-from datetime import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
 from app import db
+from sqlalchemy import func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
 from werkzeug.security import generate_password_hash, check_password_hash
 
+# pbkdf2 with a capped iteration count; werkzeug's default cost dominates
+# register/login latency. Older hashes still verify since the method is stored
+# in the hash string itself.
+PASSWORD_HASH_METHOD = 'pbkdf2:sha256:100000'
+
+# All password hashing runs on this pool. pbkdf2 releases the GIL, so the pool
+# doesn't make a single hash faster; it caps concurrent hashes at one per core
+# so a burst of logins can't saturate the CPU and starve every other request.
+HASH_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='password-hash')
+
+def hash_password(password):
+    """Hashes a password on HASH_EXECUTOR."""
+    return HASH_EXECUTOR.submit(generate_password_hash, password, method=PASSWORD_HASH_METHOD).result()
+
+def verify_password(password_hash, password):
+    """Checks a password against a hash on HASH_EXECUTOR."""
+    return HASH_EXECUTOR.submit(check_password_hash, password_hash, password).result()
+
+class utcnow(FunctionElement):
+    """Server-side current UTC timestamp, rendered per dialect for naive DateTime columns."""
+    type = db.DateTime()
+    inherit_cache = True
+
+@compiles(utcnow)
+def _utcnow_default(element, compiler, **kw):
+    # SQLite's CURRENT_TIMESTAMP is already UTC
+    return 'CURRENT_TIMESTAMP'
+
+@compiles(utcnow, 'postgresql')
+def _utcnow_postgresql(element, compiler, **kw):
+    # now() is in the session's time zone; convert before it lands in a naive column
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -9,37 +46,62 @@ class User(db.Model):
     password_hash = db.Column(db.String(256), nullable=False)
     is_freelancer = db.Column(db.Boolean, default=False, nullable=False)
     bio = db.Column(db.Text, nullable=True)
-    skills = db.Column(db.Text, nullable=True)  # e.g., "Python,React,Graphic Design"
     ranking_score = db.Column(db.Float, default=0.0)
+    # Running totals so ranking_score can be updated without re-reading reviews
+    rating_sum = db.Column(db.Integer, default=0, nullable=False)
+    rating_count = db.Column(db.Integer, default=0, nullable=False)
 
     # Relationships
     # Projects where this user is the client
-    projects_as_client = db.relationship('Project', foreign_keys='Project.client_id', back_populates='client', lazy='dynamic')
+    projects_as_client = db.relationship('Project', foreign_keys='Project.client_id', back_populates='client', lazy='select')
     # Projects where this user is the freelancer
-    projects_as_freelancer = db.relationship('Project', foreign_keys='Project.freelancer_id', back_populates='freelancer', lazy='dynamic')
+    projects_as_freelancer = db.relationship('Project', foreign_keys='Project.freelancer_id', back_populates='freelancer', lazy='select')
     # Bids made by this user (must be a freelancer)
-    bids = db.relationship('Bid', back_populates='freelancer', lazy='dynamic')
+    bids = db.relationship('Bid', back_populates='freelancer', lazy='select')
     # Reviews written by this user
-    reviews_given = db.relationship('Review', foreign_keys='Review.reviewer_id', back_populates='reviewer', lazy='dynamic')
+    reviews_given = db.relationship('Review', foreign_keys='Review.reviewer_id', back_populates='reviewer', lazy='select')
     # Reviews received by this user
-    reviews_received = db.relationship('Review', foreign_keys='Review.reviewee_id', back_populates='reviewee', lazy='dynamic')
+    reviews_received = db.relationship('Review', foreign_keys='Review.reviewee_id', back_populates='reviewee', lazy='select')
+    # Skill tags, e.g. Python, React, Graphic Design
+    skills = db.relationship('UserSkill', back_populates='user', lazy='select', cascade="all, delete-orphan", order_by='UserSkill.position')
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return self.password_hash.split('$', 1)[0] != PASSWORD_HASH_METHOD
 
     def __repr__(self):
         return f'<User {self.username}>'
 
+class UserSkill(db.Model):
+    # One row per skill tag on a user, so freelancer search is an indexed lookup
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    skill = db.Column(db.String(80), primary_key=True)
+    # Keeps skills in the order the user entered them
+    position = db.Column(db.Integer, default=0, nullable=False)
+
+    # Relationships
+    user = db.relationship('User', back_populates='skills')
+
+    __table_args__ = (
+        # Expression index so case-insensitive skill search stays an index lookup
+        db.Index('ix_user_skill_skill_user', func.lower(skill), user_id),
+    )
+
+    def __repr__(self):
+        return f'<UserSkill {self.skill} on User {self.user_id}>'
+
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(150), nullable=False)
     description = db.Column(db.Text, nullable=False)
     budget = db.Column(db.Float, nullable=False)
     status = db.Column(db.String(20), default='open', nullable=False)  # open, in_progress, completed, cancelled
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
     
     # ForeignKeys
     client_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -48,17 +110,45 @@ class Project(db.Model):
     # Relationships
     client = db.relationship('User', foreign_keys=[client_id], back_populates='projects_as_client')
     freelancer = db.relationship('User', foreign_keys=[freelancer_id], back_populates='projects_as_freelancer')
-    bids = db.relationship('Bid', back_populates='project', lazy='dynamic', cascade="all, delete-orphan")
-    reviews = db.relationship('Review', back_populates='project', lazy='dynamic', cascade="all, delete-orphan")
+    bids = db.relationship('Bid', back_populates='project', lazy='select', cascade="all, delete-orphan")
+    reviews = db.relationship('Review', back_populates='project', lazy='select', cascade="all, delete-orphan")
+    skills = db.relationship('ProjectSkill', back_populates='project', lazy='select', cascade="all, delete-orphan", order_by='ProjectSkill.position')
+
+    # Fetch server defaults (id, created_at) via INSERT ... RETURNING
+    __mapper_args__ = {'eager_defaults': True}
+
+    __table_args__ = (
+        # Matches the open-projects listing: filter on status, newest first
+        db.Index('ix_project_status_created', 'status', 'created_at'),
+    )
 
     def __repr__(self):
         return f'<Project {self.title}>'
 
+class ProjectSkill(db.Model):
+    # One row per skill tag on a project, so skill search is an indexed lookup
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    skill = db.Column(db.String(80), primary_key=True)
+    # Keeps skills in the order the client entered them
+    position = db.Column(db.Integer, default=0, nullable=False)
+
+    # Relationships
+    project = db.relationship('Project', back_populates='skills')
+
+    __table_args__ = (
+        # Expression index so case-insensitive skill search stays an index lookup
+        db.Index('ix_project_skill_skill_project', func.lower(skill), project_id),
+    )
+
+    def __repr__(self):
+        return f'<ProjectSkill {self.skill} on Project {self.project_id}>'
+
 class Bid(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     amount = db.Column(db.Float, nullable=False)
     proposal = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    status = db.Column(db.String(20), default='pending', nullable=False)  # pending, accepted, rejected
+    created_at = db.Column(db.DateTime, server_default=utcnow())
 
     # ForeignKeys
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
@@ -68,6 +158,13 @@ class Bid(db.Model):
     project = db.relationship('Project', back_populates='bids')
     freelancer = db.relationship('User', back_populates='bids')
 
+    __mapper_args__ = {'eager_defaults': True}
+
+    __table_args__ = (
+        # One bid per freelancer per project
+        db.Index('ix_bid_project_freelancer', 'project_id', 'freelancer_id', unique=True),
+    )
+
     def __repr__(self):
         return f'<Bid {self.amount} on Project {self.project_id}>'
 
@@ -75,17 +172,24 @@ class Review(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     rating = db.Column(db.Integer, nullable=False)  # 1 to 5
     comment = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, server_default=utcnow())
     
     # ForeignKeys
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
     reviewer_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
-    reviewee_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    reviewee_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
 
     # Relationships
     project = db.relationship('Project', back_populates='reviews')
     reviewer = db.relationship('User', foreign_keys=[reviewer_id], back_populates='reviews_given')
     reviewee = db.relationship('User', foreign_keys=[reviewee_id], back_populates='reviews_received')
 
+    __mapper_args__ = {'eager_defaults': True}
+
+    __table_args__ = (
+        # One review per reviewer per project
+        db.Index('ix_review_project_reviewer', 'project_id', 'reviewer_id', unique=True),
+    )
+
     def __repr__(self):
         return f'<Review {self.rating}/5 for Project {self.project_id}>'
\ No newline at end of file
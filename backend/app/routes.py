@@ -1,43 +1,93 @@
-from flask import Blueprint, request, jsonify
-from app import db
-from app.models import User, Project, Bid, Review
-from app.schemas import UserSchema, ProjectSchema, BidSchema, ReviewSchema
+from flask import Blueprint, request, jsonify, current_app, abort
+from app import db, cache
+from app.models import User, UserSkill, Project, Bid, Review, ProjectSkill, PASSWORD_HASH_METHOD, verify_password
+from app.schemas import UserSchema, FreelancerSchema, ProjectSchema, BidSchema, ReviewSchema
 from werkzeug.security import generate_password_hash
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from sqlalchemy import or_
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity, get_jwt
+from sqlalchemy import or_, func, update, case, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import joinedload, selectinload, load_only
 
 # Initialize Schemas
-user_schema = UserSchema()
-users_schema = UserSchema(many=True)
+# Review history is opt-in (?include=reviews); by default users dump without it
+user_schema = UserSchema(exclude=('reviews_received',))
+user_with_reviews_schema = UserSchema()
+freelancers_schema = FreelancerSchema(many=True)
 project_schema = ProjectSchema()
-projects_schema = ProjectSchema(many=True)
 bid_schema = BidSchema()
 bids_schema = BidSchema(many=True)
 review_schema = ReviewSchema()
+reviews_schema = ReviewSchema(many=True)
+
+# Hashed once at import; checked against on unknown emails so a failed login
+# takes the same time whether or not the account exists
+DUMMY_HASH = generate_password_hash('dummy', method=PASSWORD_HASH_METHOD)
 
 # Create Blueprint
 api_bp = Blueprint('api', __name__)
 
 # --- Helper Functions ---
+def current_user_id():
+    """Helper to get the logged-in user's id; the JWT subject is issued as a string."""
+    return int(get_jwt_identity())
+
 def get_user_from_jwt():
     """Helper to get the User object from the JWT token."""
-    user_id = get_jwt_identity()
-    return User.query.get(user_id)
-
-def update_user_ranking(user_id):
-    """Recalculates and updates a user's average ranking score."""
-    user = User.query.get(user_id)
-    if not user:
-        return
-
-    reviews = user.reviews_received.all()
-    if not reviews:
-        user.ranking_score = 0.0
+    return User.query.get(current_user_id())
+
+def insert_unless_exists(model, values, index_elements):
+    """
+    INSERT ... ON CONFLICT DO NOTHING RETURNING for the current dialect.
+    Returns the new object, or None if the unique index already had a matching row.
+    """
+    dialect_name = db.engine.dialect.name
+    if dialect_name == 'postgresql':
+        dialect = postgresql
+    elif dialect_name == 'sqlite':
+        dialect = sqlite
     else:
-        total_rating = sum(r.rating for r in reviews)
-        user.ranking_score = round(total_rating / len(reviews), 2)
-    
-    db.session.commit()
+        raise NotImplementedError(f'insert_unless_exists does not support the {dialect_name} dialect')
+    stmt = dialect.insert(model).values(**values) \
+        .on_conflict_do_nothing(index_elements=index_elements) \
+        .returning(model)
+    return db.session.scalars(stmt).first()
+
+def project_query_for_dump():
+    """Project query that eager-loads everything ProjectSchema nests."""
+    return Project.query.options(
+        joinedload(Project.client),
+        joinedload(Project.freelancer),
+        selectinload(Project.bids).joinedload(Bid.freelancer),
+        selectinload(Project.reviews).joinedload(Review.reviewer),
+        selectinload(Project.reviews).joinedload(Review.reviewee),
+        selectinload(Project.skills),
+    )
+
+def skill_rows(model, raw):
+    """Builds UserSkill/ProjectSkill rows from a comma-separated string, keeping the given order."""
+    return [model(skill=name, position=i) for i, name in enumerate(parse_skills(raw))]
+
+def project_columns_or_404(id, *columns):
+    """
+    Reads only the given Project columns as a plain row, without building an
+    ORM object or touching relationships. Aborts with 404 if there is no such project.
+    """
+    row = db.session.execute(select(*columns).where(Project.id == id)).first()
+    if row is None:
+        abort(404)
+    return row
+
+def parse_skills(raw):
+    """
+    Splits a comma-separated skills string into names, dropping blanks and
+    case-insensitive duplicates. The first spelling given is kept.
+    """
+    names = {}
+    for name in (raw or '').split(','):
+        name = name.strip()
+        if name:
+            names.setdefault(name.lower(), name)
+    return list(names.values())
 
 # --- Authentication Routes ---
 
@@ -58,17 +108,34 @@ def register():
     new_user.set_password(data['password'])
     
     db.session.add(new_user)
+    db.session.flush()
+    # Dump before committing: the flush already filled every column, whereas
+    # commit would expire the object and force a re-SELECT
+    result = user_schema.dump(new_user)
     db.session.commit()
     
-    return user_schema.dump(new_user), 201
+    return result, 201
 
 @api_bp.route('/auth/login', methods=['POST'])
 def login():
     data = request.get_json()
     user = User.query.filter_by(email=data['email']).first()
 
-    if user and user.check_password(data['password']):
-        access_token = create_access_token(identity=user.id)
+    if user is None:
+        # Burn the same hashing work as a real check before rejecting
+        verify_password(DUMMY_HASH, data['password'])
+        return jsonify({"msg": "Bad username or password"}), 401
+
+    if user.check_password(data['password']):
+        # Upgrade hashes made with an older/different method while we have the password
+        if user.password_needs_rehash():
+            user.set_password(data['password'])
+            db.session.commit()
+
+        # is_freelancer rides along in the token so routes can check it without a query
+        access_token = create_access_token(
+            identity=str(user.id), additional_claims={'is_freelancer': user.is_freelancer}
+        )
         return jsonify(access_token=access_token, user=user_schema.dump(user)), 200
     
     return jsonify({"msg": "Bad username or password"}), 401
@@ -77,9 +144,30 @@ def login():
 
 @api_bp.route('/user/<int:id>', methods=['GET'])
 def get_user_profile(id):
+    if request.args.get('include') == 'reviews':
+        user = User.query.options(
+            selectinload(User.reviews_received).joinedload(Review.reviewer),
+            selectinload(User.reviews_received).joinedload(Review.reviewee),
+        ).get_or_404(id)
+        return user_with_reviews_schema.dump(user), 200
+
     user = User.query.get_or_404(id)
     return user_schema.dump(user), 200
 
+@api_bp.route('/user/<int:id>/reviews', methods=['GET'])
+def get_user_reviews(id):
+    User.query.options(load_only(User.id)).get_or_404(id)
+    page = Review.query.options(
+        joinedload(Review.reviewer),
+        joinedload(Review.reviewee),
+    ).filter_by(reviewee_id=id).order_by(Review.created_at.desc(), Review.id.desc()).paginate()
+    return jsonify(
+        reviews=reviews_schema.dump(page.items),
+        page=page.page,
+        pages=page.pages,
+        total=page.total
+    ), 200
+
 @api_bp.route('/user/profile', methods=['GET', 'PUT'])  # <-- Added 'GET'
 @jwt_required()
 def my_profile():  # <-- Renamed the function
@@ -94,55 +182,119 @@ def my_profile():  # <-- Renamed the function
         # This is the original update logic
         data = request.get_json()
         user.bio = data.get('bio', user.bio)
-        user.skills = data.get('skills', user.skills)
+        if 'skills' in data:
+            user.skills = skill_rows(UserSkill, data['skills'])
 
         db.session.commit()
         return user_schema.dump(user), 200
 
+@api_bp.route('/freelancers', methods=['GET'])
+def get_freelancers():
+    skill_query = request.args.get('skill')
+    query = User.query.options(selectinload(User.skills)).filter_by(is_freelancer=True)
+
+    if skill_query:
+        # Case-insensitive match against the indexed user_skill table
+        query = query.join(UserSkill).filter(func.lower(UserSkill.skill) == skill_query.strip().lower())
+
+    freelancers = query.order_by(User.ranking_score.desc(), User.id).all()
+    return freelancers_schema.dump(freelancers), 200
+
 # --- Project Routes ---
 
 @api_bp.route('/projects', methods=['GET'])
 def get_projects():
-    skill_query = request.args.get('skill')
-    
-    query = Project.query.filter_by(status='open')
+    # Lower-cased so the match is case-insensitive and 'Python'/'python' share a cache entry
+    skill_query = (request.args.get('skill') or '').strip().lower() or None
+    return current_app.response_class(open_projects_json(skill_query), mimetype='application/json')
+
+@cache.memoize(timeout=30)
+def open_projects_json(skill_query):
+    """
+    Serialized open-projects listing, cached per skill filter.
+    Holds the final JSON text so cache hits skip the database entirely.
+    Cleared by every route that changes what the listing shows.
+    """
+    # A flat column projection: no ORM objects, relationship loads or marshmallow.
+    # Cards only need the project's scalars plus the client's name and score.
+    bid_count = select(func.count(Bid.id)).where(Bid.project_id == Project.id).scalar_subquery()
+    stmt = select(
+        Project.id,
+        Project.title,
+        Project.description,
+        Project.budget,
+        Project.status,
+        Project.created_at,
+        Project.client_id,
+        User.username.label('client_username'),
+        User.ranking_score.label('client_ranking_score'),
+        bid_count.label('bid_count'),
+    ).join(User, User.id == Project.client_id).where(Project.status == 'open')
     
     if skill_query:
-        # This is a simple 'like' search. A real app might use a tags table.
-        query = query.filter(Project.description.like(f"%{skill_query}%"))
+        # Case-insensitive match against the indexed project_skill table
+        stmt = stmt.join(ProjectSkill, ProjectSkill.project_id == Project.id) \
+            .where(func.lower(ProjectSkill.skill) == skill_query)
         
-    projects = query.order_by(Project.created_at.desc()).all()
-    return projects_schema.dump(projects), 200
+    rows = db.session.execute(stmt.order_by(Project.created_at.desc(), Project.id.desc())).all()
+
+    # Skill tags for every listed project in one extra query
+    skills = {row.id: [] for row in rows}
+    if skills:
+        tag_rows = db.session.execute(
+            select(ProjectSkill.project_id, ProjectSkill.skill)
+            .where(ProjectSkill.project_id.in_(skills))
+            .order_by(ProjectSkill.project_id, ProjectSkill.position)
+        )
+        for project_id, skill in tag_rows:
+            skills[project_id].append(skill)
+
+    projects = []
+    for row in rows:
+        project = row._asdict()
+        project['client'] = {
+            'id': project['client_id'],
+            'username': project.pop('client_username'),
+            'ranking_score': project.pop('client_ranking_score'),
+        }
+        project['skills'] = skills[row.id]
+        projects.append(project)
+    return current_app.json.dumps(projects)
 
 @api_bp.route('/projects', methods=['POST'])
 @jwt_required()
 def create_project():
-    user = get_user_from_jwt()
+    user_id = current_user_id()
     data = request.get_json()
     
     new_project = Project(
         title=data['title'],
         description=data['description'],
         budget=data['budget'],
-        client_id=user.id
+        client_id=user_id,
+        skills=skill_rows(ProjectSkill, data.get('skills'))
     )
     
     db.session.add(new_project)
+    db.session.flush()
+    # Dump before committing so the RETURNING values are used instead of a re-SELECT
+    result = project_schema.dump(new_project)
     db.session.commit()
-    return project_schema.dump(new_project), 201
+    cache.delete_memoized(open_projects_json)
+    return result, 201
 
 @api_bp.route('/project/<int:id>', methods=['GET'])
 def get_project(id):
-    project = Project.query.get_or_404(id)
+    project = project_query_for_dump().get_or_404(id)
     return project_schema.dump(project), 200
 
 @api_bp.route('/project/<int:id>', methods=['PUT'])
 @jwt_required()
 def update_project(id):
-    project = Project.query.get_or_404(id)
-    user = get_user_from_jwt()
+    project = project_query_for_dump().get_or_404(id)
+    user_id = current_user_id()
     
-    if project.client_id != user.id:
+    if project.client_id != user_id:
         return jsonify({"msg": "Not authorized"}), 403
         
     data = request.get_json()
@@ -150,82 +302,98 @@ def update_project(id):
     project.description = data.get('description', project.description)
     project.budget = data.get('budget', project.budget)
     project.status = data.get('status', project.status)
+    if 'skills' in data:
+        project.skills = skill_rows(ProjectSkill, data['skills'])
     
     db.session.commit()
+    cache.delete_memoized(open_projects_json)
     return project_schema.dump(project), 200
 
 @api_bp.route('/project/<int:id>/accept_bid', methods=['POST'])
 @jwt_required()
 def accept_bid(id):
-    project = Project.query.get_or_404(id)
-    user = get_user_from_jwt()
-    
-    if project.client_id != user.id:
-        return jsonify({"msg": "Not authorized"}), 403
-        
-    if project.status != 'open':
-        return jsonify({"msg": "Project is not open for bidding"}), 400
-        
+    user_id = current_user_id()
     data = request.get_json()
     bid_id = data.get('bid_id')
-    bid = Bid.query.get_or_404(bid_id)
     
-    if bid.project_id != project.id:
+    # One UPDATE ... FROM bid: assigns the bid's freelancer only if the caller owns
+    # the project, it is still open and the bid belongs to it
+    result = db.session.execute(
+        update(Project)
+        .where(
+            Project.id == id,
+            Project.client_id == user_id,
+            Project.status == 'open',
+            Bid.id == bid_id,
+            Bid.project_id == Project.id,
+        )
+        .values(freelancer_id=Bid.freelancer_id, status='in_progress'),
+        execution_options={'synchronize_session': False}
+    )
+    if not result.rowcount:
+        # Nothing matched; load just enough to say why
+        project = project_columns_or_404(id, Project.client_id, Project.status)
+        if project.client_id != user_id:
+            return jsonify({"msg": "Not authorized"}), 403
+        if project.status != 'open':
+            return jsonify({"msg": "Project is not open for bidding"}), 400
+        Bid.query.options(load_only(Bid.project_id)).get_or_404(bid_id)
         return jsonify({"msg": "Bid does not belong to this project"}), 400
-        
-    project.freelancer_id = bid.freelancer_id
-    project.status = 'in_progress'
     
+    # Close out the other bids in the same transaction
+    Bid.query.filter_by(project_id=id).update(
+        {'status': case((Bid.id == bid_id, 'accepted'), else_='rejected')},
+        synchronize_session=False
+    )
     db.session.commit()
-    return project_schema.dump(project), 200
+    cache.delete_memoized(open_projects_json)
+    return project_schema.dump(project_query_for_dump().get(id)), 200
 
 # --- Bid Routes ---
 
 @api_bp.route('/project/<int:id>/bid', methods=['POST'])
 @jwt_required()
 def place_bid(id):
-    user = get_user_from_jwt()
-    project = Project.query.get_or_404(id)
+    user_id = current_user_id()
+    project = project_columns_or_404(id, Project.status)
     
-    if not user.is_freelancer:
+    if not get_jwt().get('is_freelancer'):
         return jsonify({"msg": "Only freelancers can bid"}), 403
         
     if project.status != 'open':
         return jsonify({"msg": "Project is not open for bidding"}), 400
         
-    # Check if this freelancer has already bid
-    existing_bid = Bid.query.filter_by(project_id=id, freelancer_id=user.id).first()
-    if existing_bid:
-        return jsonify({"msg": "You have already placed a bid on this project"}), 400
-
     data = request.get_json()
-    new_bid = Bid(
+    new_bid = insert_unless_exists(Bid, dict(
         amount=data['amount'],
         proposal=data['proposal'],
         project_id=id,
-        freelancer_id=user.id
-    )
+        freelancer_id=user_id
+    ), index_elements=['project_id', 'freelancer_id'])
+    if new_bid is None:
+        return jsonify({"msg": "You have already placed a bid on this project"}), 400
     
-    db.session.add(new_bid)
+    result = bid_schema.dump(new_bid)
     db.session.commit()
-    return bid_schema.dump(new_bid), 201
+    cache.delete_memoized(open_projects_json)
+    return result, 201
 
 # --- Review Routes ---
 
 @api_bp.route('/project/<int:id>/review', methods=['POST'])
 @jwt_required()
 def post_review(id):
-    project = Project.query.get_or_404(id)
-    user = get_user_from_jwt()
+    project = project_columns_or_404(id, Project.status, Project.client_id, Project.freelancer_id)
+    user_id = current_user_id()
     data = request.get_json()
     
     if project.status != 'completed':
         return jsonify({"msg": "Project must be completed to leave a review"}), 400
     
     reviewee_id = None
-    if user.id == project.client_id:
+    if user_id == project.client_id:
         reviewee_id = project.freelancer_id
-    elif user.id == project.freelancer_id:
+    elif user_id == project.freelancer_id:
         reviewee_id = project.client_id
     else:
         return jsonify({"msg": "You are not part of this project"}), 403
@@ -233,23 +401,31 @@ def post_review(id):
     if not reviewee_id:
         return jsonify({"msg": "Cannot review this project (no freelancer assigned)"}), 400
 
-    # Check if a review already exists
-    existing_review = Review.query.filter_by(project_id=id, reviewer_id=user.id).first()
-    if existing_review:
-        return jsonify({"msg": "You have already reviewed this project"}), 400
-
-    new_review = Review(
+    new_review = insert_unless_exists(Review, dict(
         rating=data['rating'],
         comment=data.get('comment'),
         project_id=id,
-        reviewer_id=user.id,
+        reviewer_id=user_id,
         reviewee_id=reviewee_id
-    )
-    
-    db.session.add(new_review)
+    ), index_elements=['project_id', 'reviewer_id'])
+    if new_review is None:
+        return jsonify({"msg": "You have already reviewed this project"}), 400
+
+    # Update the reviewee's running totals and ranking score in a single UPDATE
+    User.query.filter_by(id=reviewee_id).update({
+        'rating_sum': User.rating_sum + new_review.rating,
+        'rating_count': User.rating_count + 1,
+        'ranking_score': func.round(
+            db.cast(
+                db.cast(User.rating_sum + new_review.rating, db.Float) / (User.rating_count + 1),
+                db.Numeric,
+            ),
+            2,
+        ),
+    })
+    result = review_schema.dump(new_review)
     db.session.commit()
+    # The listing shows each client's ranking_score, which this review may have changed
+    cache.delete_memoized(open_projects_json)
     
-    # Update the reviewee's ranking score
-    update_user_ranking(reviewee_id)
-    
-    return review_schema.dump(new_review), 201
\ No newline at end of file
+    return result, 201
\ No newline at end of file
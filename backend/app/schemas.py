@@ -1,7 +1,11 @@
 from app import ma
-from app.models import User, Project, Bid, Review
+from app.models import User, Project, Bid, Review, ProjectSkill
 from marshmallow import fields
 
+def join_skills(user):
+    # Skill tags as the comma-separated string the frontend edits, e.g. "Python,React"
+    return ','.join(s.skill for s in user.skills) or None
+
 # --- Nested Schemas ---
 # Used to show minimal user info inside other objects
 class UserPublicSchema(ma.SQLAlchemyAutoSchema):
@@ -9,6 +13,18 @@ class UserPublicSchema(ma.SQLAlchemyAutoSchema):
         model = User
         fields = ('id', 'username', 'is_freelancer', 'ranking_score')
 
+# Public user info plus skill tags, for the freelancer listing
+class FreelancerSchema(UserPublicSchema):
+    skills = fields.Function(join_skills, dump_only=True)
+
+    class Meta(UserPublicSchema.Meta):
+        fields = UserPublicSchema.Meta.fields + ('skills',)
+
+class ProjectSkillSchema(ma.SQLAlchemyAutoSchema):
+    class Meta:
+        model = ProjectSkill
+        fields = ('skill',)
+
 # --- Main Schemas ---
 
 class ReviewSchema(ma.SQLAlchemyAutoSchema):
@@ -33,6 +49,8 @@ class ProjectSchema(ma.SQLAlchemyAutoSchema):
     freelancer = fields.Nested(UserPublicSchema)
     bids = fields.Nested(BidSchema, many=True)
     reviews = fields.Nested(ReviewSchema, many=True)
+    # Dumped as a flat list of skill names
+    skills = fields.Pluck(ProjectSkillSchema, 'skill', many=True, dump_only=True)
 
     class Meta:
         model = Project
@@ -42,12 +60,13 @@ class ProjectSchema(ma.SQLAlchemyAutoSchema):
 class UserSchema(ma.SQLAlchemyAutoSchema):
     # Reviews *received* by this user
     reviews_received = fields.Nested(ReviewSchema, many=True)
+    skills = fields.Function(join_skills, dump_only=True)
     
     class Meta:
         model = User
         load_instance = True
         # Exclude password_hash from all dumps
-        exclude = ('password_hash',)
+        exclude = ('password_hash', 'rating_sum', 'rating_count')
     
     # Use 'password' field for loading, but it maps to 'password_hash' model attribute
     password = fields.String(load_only=True, required=True)
\ No newline at end of file
@@ -11,6 +11,15 @@ load_dotenv()
 class Config:
     """Base configuration."""
     SECRET_KEY = os.environ.get('SECRET_KEY') or "dev_secret_key_1234567890!@#$"
-    JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or "dev_jwt_secret_key_0987654321!@#$"
+    # Stored as bytes so the HMAC key isn't re-encoded on every token sign/verify
+    JWT_SECRET_KEY = (os.environ.get('JWT_SECRET_KEY') or "dev_jwt_secret_key_0987654321!@#$").encode()
+    JWT_ALGORITHM = os.environ.get('JWT_ALGORITHM') or 'HS256'
+    # PEM keys, only used with RS*/ES*/PS* algorithms; parsed once in create_app
+    JWT_PUBLIC_KEY = os.environ.get('JWT_PUBLIC_KEY')
+    JWT_PRIVATE_KEY = os.environ.get('JWT_PRIVATE_KEY')
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///site.db'
-    SQLALCHEMY_TRACK_MODIFICATIONS = False
\ No newline at end of file
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Set CACHE_TYPE=RedisCache and CACHE_REDIS_URL in production so workers share the cache
+    CACHE_TYPE = os.environ.get('CACHE_TYPE') or 'SimpleCache'
+    CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+    CACHE_DEFAULT_TIMEOUT = 30
\ No newline at end of file
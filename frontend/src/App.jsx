@@ -566,6 +566,7 @@ const PostProjectPage = () => {
   const [title, setTitle] = useState('');
   const [description, setDescription] = useState('');
   const [budget, setBudget] = useState('');
+  const [skills, setSkills] = useState('');
   const [error, setError] = useState('');
   const [success, setSuccess] = useState('');
   const navigate = useNavigate();
@@ -578,7 +579,8 @@ const PostProjectPage = () => {
       const response = await axios.post('/projects', {
         title,
         description,
-        budget: parseFloat(budget)
+        budget: parseFloat(budget),
+        skills
       });
       setSuccess('Project posted successfully! Redirecting...');
       setTimeout(() => navigate(`/project/${response.data.id}`), 2000);
@@ -625,6 +627,16 @@ const PostProjectPage = () => {
               min="1"
             />
           </div>
+          <div>
+            <label className="form-label">Skills (comma-separated)</label>
+            <input
+              type="text"
+              className="form-input"
+              value={skills}
+              onChange={(e) => setSkills(e.target.value)}
+              placeholder="e.g., Python,Flask,SQLAlchemy"
+            />
+          </div>
           <button type="submit" className="btn btn-primary w-full">
             Post Project
           </button>
@@ -644,16 +656,25 @@ const UserProfilePage = () => {
   const [isEditing, setIsEditing] = useState(false);
   const [editBio, setEditBio] = useState('');
   const [editSkills, setEditSkills] = useState('');
+  const [reviews, setReviews] = useState([]);
+  const [reviewsPage, setReviewsPage] = useState(1);
+  const [reviewsPages, setReviewsPages] = useState(1);
 
   const isCurrentUser = currentUser?.id === parseInt(id);
 
   const fetchProfile = async () => {
     try {
       setLoading(true);
-      const response = await axios.get(`/user/${id}`);
+      const [response, reviewsResponse] = await Promise.all([
+        axios.get(`/user/${id}`),
+        axios.get(`/user/${id}/reviews`)
+      ]);
       setProfile(response.data);
       setEditBio(response.data.bio || '');
       setEditSkills(response.data.skills || '');
+      setReviews(reviewsResponse.data.reviews);
+      setReviewsPage(reviewsResponse.data.page);
+      setReviewsPages(reviewsResponse.data.pages);
     } catch (err) {
       setError('Failed to load profile.');
     } finally {
@@ -661,6 +682,17 @@ const UserProfilePage = () => {
     }
   };
 
+  const loadMoreReviews = async () => {
+    try {
+      const response = await axios.get(`/user/${id}/reviews`, { params: { page: reviewsPage + 1 } });
+      setReviews(prev => [...prev, ...response.data.reviews]);
+      setReviewsPage(response.data.page);
+      setReviewsPages(response.data.pages);
+    } catch (err) {
+      setError('Failed to load reviews.');
+    }
+  };
+
   useEffect(() => {
     fetchProfile();
   }, [id]);
@@ -774,10 +806,10 @@ const UserProfilePage = () => {
       <div className="card p-8 mt-8">
         <h2 className="text-2xl font-bold mb-6">Reviews</h2>
         <div className="space-y-4">
-          {profile.reviews_received.length === 0 ? (
+          {reviews.length === 0 ? (
             <p>No reviews received yet.</p>
           ) : (
-            profile.reviews_received.map(review => (
+            reviews.map(review => (
               <div key={review.id} className="border p-4 rounded-lg">
                 <div className="flex justify-between items-center">
                   <span className="font-semibold">{review.reviewer.username}</span>
@@ -790,6 +822,11 @@ const UserProfilePage = () => {
             ))
           )}
         </div>
+        {reviewsPage < reviewsPages && (
+          <button onClick={loadMoreReviews} className="btn btn-secondary mt-4">
+            Load more reviews
+          </button>
+        )}
       </div>
     </div>
   );